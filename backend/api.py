@@ -1,10 +1,12 @@
 import io
 import os
+import shutil
 import tempfile
 from typing import Dict, Any
 
-from fastapi import FastAPI, UploadFile, File
+from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
@@ -14,7 +16,23 @@ from .renderer import render_harvard
 from .ats import score_ats
 
 
+class _SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip responses except on paths that already return compressed bodies"""
+
+    def __init__(self, app, skip_paths=(), **kwargs):
+        super().__init__(app, **kwargs)
+        self.skip_paths = frozenset(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 app = FastAPI(title="Resume Builder API")
+# Resume JSON compresses well; /render returns a DOCX, which is already a zip
+app.add_middleware(_SelectiveGZipMiddleware, minimum_size=1024, skip_paths=("/render",))
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -47,25 +65,47 @@ class InterviewQuestionsRequest(BaseModel):
     company_name: str = ""
     position_title: str = ""
 
-@app.post("/parse")
-async def parse_resume_api(file: UploadFile = File(...)):
+def _parse_upload(file: UploadFile) -> dict:
+    """Blocking (file I/O + LLM call); only call it from sync endpoints, which FastAPI runs in its threadpool"""
     tmp_path = None
     try:
         with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            contents = await file.read()
-            tmp.write(contents)
+            shutil.copyfileobj(file.file, tmp)
             tmp_path = tmp.name
 
         raw_text = extract_text(tmp_path)
         parsed = llm_parse_resume(raw_text)
-        parsed = fallback_extract(raw_text, parsed)
+        return fallback_extract(raw_text, parsed)
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+@app.post("/parse")
+def parse_resume_api(file: UploadFile = File(...)):
+    try:
+        parsed = _parse_upload(file)
         return JSONResponse(content=parsed)
     except Exception as e:
         print(f"Error in /parse: {e}")
         return JSONResponse(content={"error": f"Failed to parse resume: {str(e)}"}, status_code=500)
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+
+
+@app.post("/process")
+def process_endpoint(file: UploadFile = File(...), job_description: str = Form(...)):
+    """
+    parse -> rewrite -> ats in one round trip, so the resume JSON crosses the
+    wire once. A plain def: both LLM calls block, so FastAPI runs this in its
+    threadpool instead of stalling the event loop.
+    """
+    try:
+        parsed = _parse_upload(file)
+        rewritten = rewrite_resume(parsed, job_description)
+        ats = score_ats(parsed, job_description)
+        return JSONResponse(content={"parsed": parsed, "rewritten": rewritten, "ats": ats})
+    except Exception as e:
+        print(f"Error in /process: {e}")
+        return JSONResponse(content={"error": f"Failed to process resume: {str(e)}"}, status_code=500)
 
 
 @app.post("/rewrite")
@@ -83,19 +123,15 @@ async def rewrite_endpoint(body: RewriteRequest):
 
 @app.post("/render")
 async def render_endpoint(resume_json: Dict[str, Any]):
-    output_path = None
     try:
-        with tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as tmp_out:
-            output_path = tmp_out.name
-        render_harvard(resume_json, output_path)
-        docx_bytes = open(output_path, "rb").read()
-        return StreamingResponse(io.BytesIO(docx_bytes), media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document", headers={"Content-Disposition": "attachment; filename=resume.docx"})
+        # Render straight into memory; nothing touches the disk
+        buf = io.BytesIO()
+        render_harvard(resume_json, buf)
+        buf.seek(0)
+        return StreamingResponse(buf, media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document", headers={"Content-Disposition": "attachment; filename=resume.docx"})
     except Exception as e:
         print(f"Error in /render: {e}")
         return JSONResponse(content={"error": f"Failed to render resume: {str(e)}"})
-    finally:
-        if output_path and os.path.exists(output_path):
-            os.unlink(output_path)
 
 
 @app.post("/ats")
@@ -168,7 +204,7 @@ async def interview_questions_endpoint(body: InterviewQuestionsRequest):
 
 
 
-@app.get("/")
+@app.api_route("/", methods=["GET", "HEAD"])
 async def root():
     return {"status": "ok"}
 
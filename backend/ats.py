@@ -1,11 +1,28 @@
 from typing import Dict, Any, List, Tuple
-import math
+from datetime import datetime
 import re
 
 
+_TOKEN_RE = re.compile(r"[A-Za-z0-9+#.]+")
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+
+# Common job title patterns
+_TITLE_PATTERNS = (
+    re.compile(r'(?:position|role|job|title):\s*([^\n\r,]+)'),
+    re.compile(r'(?:seeking|hiring|looking for)\s+(?:a\s+)?([^\n\r,]+?)(?:\s+to|\s+with|\s+who)'),
+    re.compile(r'([^\n\r,]+?)\s*(?:position|role|opportunity)'),
+    re.compile(r'we are hiring\s+(?:a\s+)?([^\n\r,]+)'),
+)
+
+_COMMON_TITLES = (
+    "data scientist", "machine learning engineer", "software engineer",
+    "data engineer", "analyst", "developer", "manager", "director",
+    "senior", "junior", "lead", "principal", "staff"
+)
+
+
 def _tokenize(text: str) -> List[str]:
-    import re
-    return [t.lower() for t in re.findall(r"[A-Za-z0-9+#.]+", text)]
+    return [t.lower() for t in _TOKEN_RE.findall(text)]
 
 
 def _flatten_resume(resume_json: dict) -> str:
@@ -75,20 +92,13 @@ def _flatten_resume(resume_json: dict) -> str:
 
 def _extract_years_experience(start_date: str, end_date: str) -> float:
     """Extract years of experience from date strings"""
-    import re
-    from datetime import datetime
-
     # Try to extract years from date strings
     current_year = datetime.now().year
 
     def extract_year(date_str: str) -> int:
-        year_match = re.search(r'\b(19|20)\d{2}\b', date_str)
-        if year_match:
-            return int(year_match.group())
-        # Handle "Present", "Current", etc.
-        if re.search(r'(?i)(present|current|now)', date_str):
-            return current_year
-        return current_year
+        # "Present", "Current", unparseable dates etc. all count as this year
+        year_match = _YEAR_RE.search(date_str)
+        return int(year_match.group()) if year_match else current_year
 
     if start_date:
         start_year = extract_year(start_date)
@@ -99,8 +109,6 @@ def _extract_years_experience(start_date: str, end_date: str) -> float:
 
 def _calculate_title_similarity(resume_json: Dict[str, Any], job_description: str) -> float:
     """Enhanced title similarity calculation"""
-    import re
-
     # Extract job titles from resume
     resume_titles = []
     for exp in resume_json.get("experience", []):
@@ -110,28 +118,14 @@ def _calculate_title_similarity(resume_json: Dict[str, Any], job_description: st
     # Extract target job title from JD
     jd_lower = job_description.lower()
 
-    # Common job title patterns
-    title_patterns = [
-        r'(?:position|role|job|title):\s*([^\n\r,]+)',
-        r'(?:seeking|hiring|looking for)\s+(?:a\s+)?([^\n\r,]+?)(?:\s+to|\s+with|\s+who)',
-        r'([^\n\r,]+?)\s*(?:position|role|opportunity)',
-        r'we are hiring\s+(?:a\s+)?([^\n\r,]+)',
-    ]
-
     jd_title_tokens = set()
-    for pattern in title_patterns:
-        matches = re.findall(pattern, jd_lower)
-        for match in matches:
+    for pattern in _TITLE_PATTERNS:
+        for match in pattern.findall(jd_lower):
             jd_title_tokens.update(_tokenize(match.strip()))
 
     # If no specific pattern found, look for common job titles
     if not jd_title_tokens:
-        common_titles = [
-            "data scientist", "machine learning engineer", "software engineer",
-            "data engineer", "analyst", "developer", "manager", "director",
-            "senior", "junior", "lead", "principal", "staff"
-        ]
-        for title in common_titles:
+        for title in _COMMON_TITLES:
             if title in jd_lower:
                 jd_title_tokens.update(_tokenize(title))
 
@@ -147,34 +141,59 @@ def _calculate_title_similarity(resume_json: Dict[str, Any], job_description: st
     return overlap / len(jd_title_tokens) if jd_title_tokens else 0
 
 
-def _categorize_keywords(tokens: set) -> Tuple[List[str], List[str]]:
-    """Better categorization of technical vs business keywords"""
+_TECHNICAL_TOKENS = frozenset({
+    'python', 'java', 'javascript', 'sql', 'react', 'nodejs', 'aws', 'docker',
+    'kubernetes', 'tensorflow', 'pytorch', 'pandas', 'numpy', 'git', 'linux',
+    'mongodb', 'postgresql', 'redis', 'spark', 'hadoop', 'tableau', 'powerbi',
+    'api', 'rest', 'graphql', 'microservices', 'devops', 'cloud', 'database',
+    'algorithm', 'framework', 'library',
+    # Compound forms the old substring scan caught via the base names above;
+    # exact matching needs them spelled out
+    'github', 'gitlab', 'mysql', 'nosql', 'mssql', 'sqlite', 'postgres',
+    'pyspark', 'restful', 'reactjs', 'react.js', 'node.js', 'typescript',
+    'scikit', 'sklearn', 'dockerfile', 'cicd', 'mlops',
+})
+
+# Unambiguous technical stems: any token starting with one is technical, which
+# covers derived forms like 'cloudformation', 'dockerized' or 'pythonic'
+_TECHNICAL_PREFIXES = (
+    'python', 'docker', 'kubernetes', 'tensorflow', 'pytorch', 'postgres',
+    'mongo', 'cloud', 'linux', 'hadoop', 'graphql', 'github',
+)
+
+_BUSINESS_TOKENS = frozenset({
+    'agile', 'scrum', 'project', 'management', 'leadership', 'communication',
+    'collaboration', 'stakeholder', 'strategy', 'analysis', 'business',
+    'requirements', 'planning', 'coordination', 'presentation', 'documentation'
+})
+
+_FILE_EXTENSION_RE = re.compile(r'^\w+\.\w+')
+
+
+def _keyword_forms(token_lower: str) -> set:
+    """Token plus its naive singular, so 'apis' matches 'api' and 'libraries' 'library'."""
+    if token_lower.endswith('ies') and len(token_lower) > 4:
+        return {token_lower, token_lower[:-3] + 'y'}
+    if token_lower.endswith('s') and len(token_lower) > 3:
+        return {token_lower, token_lower[:-1]}
+    return {token_lower}
 
-    technical_indicators = {
-        'python', 'java', 'javascript', 'sql', 'react', 'nodejs', 'aws', 'docker',
-        'kubernetes', 'tensorflow', 'pytorch', 'pandas', 'numpy', 'git', 'linux',
-        'mongodb', 'postgresql', 'redis', 'spark', 'hadoop', 'tableau', 'powerbi',
-        'machine learning', 'deep learning', 'api', 'rest', 'graphql', 'microservices',
-        'ci/cd', 'devops', 'cloud', 'database', 'algorithm', 'framework', 'library'
-    }
-
-    business_indicators = {
-        'agile', 'scrum', 'project', 'management', 'leadership', 'communication',
-        'collaboration', 'stakeholder', 'strategy', 'analysis', 'business',
-        'requirements', 'planning', 'coordination', 'presentation', 'documentation'
-    }
 
+def _categorize_keywords(tokens: set) -> Tuple[List[str], List[str]]:
+    """Better categorization of technical vs business keywords"""
     technical = []
     business = []
 
     for token in tokens:
-        token_lower = token.lower()
-        if any(tech in token_lower for tech in technical_indicators):
+        # _TOKEN_RE keeps '.', so sentence-final words arrive as e.g. 'python.'
+        token_lower = token.lower().rstrip('.')
+        forms = _keyword_forms(token_lower)
+        if not _TECHNICAL_TOKENS.isdisjoint(forms) or token_lower.startswith(_TECHNICAL_PREFIXES):
             technical.append(token)
-        elif any(biz in token_lower for biz in business_indicators):
+        elif not _BUSINESS_TOKENS.isdisjoint(forms):
             business.append(token)
-        elif re.match(r'^[A-Z]+$', token) or re.match(r'^\w+\.\w+', token):
-            technical.append(token)  # Acronyms or file extensions
+        elif _FILE_EXTENSION_RE.match(token_lower):
+            technical.append(token)  # File extensions and dotted names like 'vue.js'
         else:
             business.append(token)
 
@@ -1,8 +1,7 @@
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any
 import json
 from dotenv import load_dotenv
-import google.generativeai as genai
 from openai import OpenAI
 load_dotenv()
 
@@ -1,51 +1,81 @@
 import os
 import re
 import json
-import pdfplumber
-from PyPDF2 import PdfReader
-from docx import Document
-from PIL import Image
-import pytesseract
+
+# Heavy I/O libraries are imported inside their extractors so a call only
+# pays for the one its file extension needs.
+
+
+def _extract_pdf(file_path: str) -> str:
+    """Priority: pdfplumber for PDFs (better layout) → fallback to PyPDF2."""
+    import pdfplumber
+
+    try:
+        with pdfplumber.open(file_path) as pdf:
+            text = "\n".join(
+                page.extract_text() or "" for page in pdf.pages
+            )
+        if text.strip():
+            return text
+    except Exception as e:
+        print(f"pdfplumber failed, falling back to PyPDF2: {e}")
+
+    from PyPDF2 import PdfReader
+    # A file PdfReader can't open (corrupt, encrypted, not a PDF) must fail the
+    # request rather than hand empty text to the LLM; only per-page extraction
+    # errors are skipped
+    reader = PdfReader(file_path)
+    texts = []
+    for page in reader.pages:
+        try:
+            texts.append(page.extract_text() or "")
+        except Exception:
+            continue
+    return "\n".join(texts)
+
+
+def _extract_docx(file_path: str) -> str:
+    from docx import Document
+
+    doc = Document(file_path)
+    return "\n".join([p.text for p in doc.paragraphs])
+
+
+def _extract_image(file_path: str) -> str:
+    from PIL import Image
+    import pytesseract
+
+    image = Image.open(file_path)
+    return pytesseract.image_to_string(image)
+
+
+def _extract_txt(file_path: str) -> str:
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+_EXTRACTORS = {
+    ".pdf": _extract_pdf,
+    ".docx": _extract_docx,
+    ".png": _extract_image,
+    ".jpg": _extract_image,
+    ".jpeg": _extract_image,
+    ".tiff": _extract_image,
+    ".bmp": _extract_image,
+}
 
 
 def extract_text(file_path: str) -> str:
     """
     Extract plain text from PDF, DOCX, TXT, or image files.
-    Priority: pdfplumber for PDFs (better layout) → fallback to PyPDF2.
+    Unknown extensions are read as plain text.
     """
     ext = os.path.splitext(file_path)[1].lower()
+    return _EXTRACTORS.get(ext, _extract_txt)(file_path)
 
-    if ext == ".pdf":
-        try:
-            text = ""
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-            if text.strip():
-                return text
-        except Exception as e:
-            print(f"pdfplumber failed, falling back to PyPDF2: {e}")
-
-        reader = PdfReader(file_path)
-        texts = []
-        for page in reader.pages:
-            try:
-                texts.append(page.extract_text() or "")
-            except Exception:
-                continue
-        return "\n".join(texts)
-
-    elif ext == ".docx":
-        doc = Document(file_path)
-        return "\n".join([p.text for p in doc.paragraphs])
-
-    elif ext in [".png", ".jpg", ".jpeg", ".tiff", ".bmp"]:
-        image = Image.open(file_path)
-        return pytesseract.image_to_string(image)
-
-    else:  # default to TXT
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
+
+_EDU_FALLBACK_RE = re.compile(r"(St Joseph.*University.*?\d{4})", re.IGNORECASE)
+_EXP_FALLBACK_RE = re.compile(r"(Oryzed|Green Builders|Sastic Minds).*")
 
 
 def fallback_extract(text: str, resume_json: dict) -> dict:
@@ -55,7 +85,7 @@ def fallback_extract(text: str, resume_json: dict) -> dict:
     """
     # Fallback for Education
     if not resume_json.get("education"):
-        edu_matches = re.findall(r"(St Joseph.*University.*?\d{4})", text, re.IGNORECASE)
+        edu_matches = _EDU_FALLBACK_RE.findall(text)
         if edu_matches:
             resume_json["education"] = [{
                 "institution": edu_matches[0],
@@ -68,7 +98,7 @@ def fallback_extract(text: str, resume_json: dict) -> dict:
 
     # Fallback for Experience
     if not resume_json.get("experience"):
-        exp_matches = re.findall(r"(Oryzed|Green Builders|Sastic Minds).*", text)
+        exp_matches = _EXP_FALLBACK_RE.findall(text)
         if exp_matches:
             resume_json["experience"] = []
             for m in exp_matches:
@@ -1,273 +1,482 @@
+import hashlib
+import io
 import json
-import re
 import os
-from typing import Dict, Any, List
-from datetime import datetime
-
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from zipfile import ZipFile, ZIP_DEFLATED
+
+import docx
 from docx import Document
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from docx.shared import Pt, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Pt
+from xml.sax.saxutils import escape
+
+
+# python-docx's blank template, read once per process; each render opens a
+# fresh Document from these bytes instead of going back to disk.
+with open(os.path.join(os.path.dirname(docx.__file__), "templates", "default.docx"), "rb") as _f:
+    _TEMPLATE_BYTES = _f.read()
+
+
+# Deflate level for saved .docx files. zlib's default is 6; resumes are small
+# and usually short-lived, so a faster save beats a few KB of output size.
+_DOCX_COMPRESSLEVEL = 1
+
+
+# python-docx has no option for the level, so _save_docx reuses its part
+# serialization with a zip writer of our own. That only affects documents this
+# module saves; if the internals it relies on are missing, plain doc.save() is
+# used instead.
+try:
+    from docx.opc.pkgwriter import PackageWriter as _PackageWriter
+except ImportError:
+    _PackageWriter = None
+if not all(hasattr(_PackageWriter, name) for name in
+           ("_write_content_types_stream", "_write_pkg_rels", "_write_parts")):
+    _PackageWriter = None
+
+
+class _ZipPartWriter:
+    """The one method python-docx's PackageWriter helpers call on a physical writer"""
+
+    def __init__(self, zipf: ZipFile):
+        self._zipf = zipf
+
+    def write(self, pack_uri, blob):
+        self._zipf.writestr(pack_uri.membername, blob)
+
+
+def _save_docx(doc) -> io.BytesIO:
+    """doc.save() into memory, deflating at _DOCX_COMPRESSLEVEL."""
+    buf = io.BytesIO()
+    if _PackageWriter is None:
+        doc.save(buf)
+        return buf
+    # Same steps as OpcPackage.save / PackageWriter.write, minus the writer
+    package = doc.part.package
+    parts = package.parts
+    for part in parts:
+        part.before_marshal()
+    with ZipFile(buf, "w", compression=ZIP_DEFLATED, compresslevel=_DOCX_COMPRESSLEVEL) as zipf:
+        writer = _ZipPartWriter(zipf)
+        _PackageWriter._write_content_types_stream(writer, parts)
+        _PackageWriter._write_pkg_rels(writer, package.rels)
+        _PackageWriter._write_parts(writer, parts)
+    return buf
+
+
+_URL_PREFIXES = ("mailto:", "http://", "https://")
+
+# Namespace declarations and relationship type used by the markup builders
+_WR_NSDECLS = nsdecls("w", "r")
+_HYPERLINK_RELTYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink"
 
 
 def _ensure_url(url: str) -> str:
     if not url:
         return url
     u = url.strip()
-    if u.startswith("mailto:") or u.startswith("http://") or u.startswith("https://"):
+    if u.startswith(_URL_PREFIXES):
         return u
-    if u.startswith("www."):
-        return "https://" + u
+    # bare domains, "www." included, default to https
     return "https://" + u
 
 
-def _add_hyperlink(paragraph, url, text):
-    """Add a clickable hyperlink to a paragraph."""
+def _hyperlink_xml(part, url, text, rid_cache=None):
+    """
+    Raw <w:hyperlink> markup for a clickable, blue, underlined link. Pass the
+    same rid_cache dict for every link in a document so a repeated URL reuses
+    its relationship id.
+    """
     url = _ensure_url(url)
-    part = paragraph.part
-    r_id = part.relate_to(url, "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink", is_external=True)
-
-    hyperlink = OxmlElement('w:hyperlink')
-    hyperlink.set(qn('r:id'), r_id)
+    r_id = rid_cache.get(url) if rid_cache is not None else None
+    if r_id is None:
+        r_id = part.relate_to(url, _HYPERLINK_RELTYPE, is_external=True)
+        if rid_cache is not None:
+            rid_cache[url] = r_id
 
-    new_run = OxmlElement('w:r')
-    rPr = OxmlElement('w:rPr')
+    return (
+        f'<w:hyperlink r:id="{r_id}"><w:r>'
+        '<w:rPr><w:color w:val="0000FF"/><w:u w:val="single"/></w:rPr>'
+        f'<w:t xml:space="preserve">{escape(text)}</w:t>'
+        '</w:r></w:hyperlink>'
+    )
 
-    # underline + blue color
-    u = OxmlElement('w:u'); u.set(qn('w:val'), 'single'); rPr.append(u)
-    color = OxmlElement('w:color'); color.set(qn('w:val'), "0000FF"); rPr.append(color)
 
-    new_run.append(rPr)
-    t = OxmlElement('w:t'); t.text = text
-    new_run.append(t)
-    hyperlink.append(new_run)
-    paragraph._element.append(hyperlink)
-    return hyperlink
+# Section divider: an empty paragraph with a bottom border. The spaced variant
+# replaces the blank spacer line that used to close the education, experience
+# and certification sections (one 11pt line plus its 2pt gap).
+_DIVIDER_XML = (
+    '<w:p><w:pPr><w:pBdr>'
+    '<w:bottom w:val="single" w:sz="6" w:space="1" w:color="000000"/>'
+    '</w:pBdr></w:pPr></w:p>'
+)
+_SPACED_DIVIDER_XML = _DIVIDER_XML.replace('</w:pBdr>', '</w:pBdr><w:spacing w:before="260"/>')
 
 
-def _add_divider(doc):
-    p = doc.add_paragraph()
-    p_par = p._element
-    pPr = p_par.get_or_add_pPr()
-    p_borders = OxmlElement('w:pBdr')
-    bottom = OxmlElement('w:bottom')
-    bottom.set(qn('w:val'), 'single')
-    bottom.set(qn('w:sz'), '6')
-    bottom.set(qn('w:space'), '1')
-    bottom.set(qn('w:color'), '000000')
-    p_borders.append(bottom)
-    pPr.append(p_borders)
-    return p
+def _section_xml(title: str, content: list, divider: str = _DIVIDER_XML) -> str:
+    """One resume section: bold left-aligned title, its fragments, then the closing divider."""
+    title_xml = _paragraph_xml(_run_xml(title.upper(), bold=True), align="left")
+    return title_xml + "".join(content) + divider
 
 
-def _add_section_title(doc, title: str):
-    p = doc.add_paragraph()
-    run = p.add_run(title.upper())
-    run.bold = True
-    p.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+# NULL bytes and control characters except for common whitespace (\t \n \r)
+_CTRL_TABLE = dict.fromkeys(list(range(0x09)) + [0x0B, 0x0C] + list(range(0x0E, 0x20)) + [0x7F])
 
 
+@lru_cache(maxsize=2048)
 def _safe_text(text: str) -> str:
     """Ensure text is safe for docx XML by removing any problematic characters."""
     if not text:
         return ""
 
-    # Remove NULL bytes and control characters except for common whitespace
-    sanitized = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
+    # Printable text has no control characters and no whitespace besides plain
+    # spaces, so if those are already single and inner there is nothing to do
+    if text.isprintable() and "  " not in text and text[0] != " " and text[-1] != " ":
+        return text
+
+    # Remove control characters; split/join collapses whitespace runs and strips the ends
+    return " ".join(text.translate(_CTRL_TABLE).split())
+
+
+# Fixed markup for the fragment shapes the Harvard layout uses, specialized
+# once at import so each call only fills in text.
+_RUN_PROPS = {
+    (False, False): "",
+    (True, False): "<w:rPr><w:b/></w:rPr>",
+    (False, True): "<w:rPr><w:i/></w:rPr>",
+    (True, True): "<w:rPr><w:b/><w:i/></w:rPr>",
+}
+
+# Bold 16pt for the name line (w:sz is in half-points)
+_NAME_RPR = '<w:rPr><w:b/><w:sz w:val="32"/></w:rPr>'
+
+
+def _run_xml(text: str, bold: bool = False, italic: bool = False) -> str:
+    """Raw <w:r> markup for one run; callers sanitize text with _safe_text first."""
+    return f'<w:r>{_RUN_PROPS[bold, italic]}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+
+def _paragraph_xml(*runs: str, align: str = "", space_after: float = None) -> str:
+    """Raw <w:p> markup wrapping the given run fragments; space_after is in points."""
+    ppr = ""
+    if space_after is not None:
+        ppr += f'<w:spacing w:after="{round(space_after * 20)}"/>'
+    if align:
+        ppr += f'<w:jc w:val="{align}"/>'
+    if ppr:
+        ppr = f"<w:pPr>{ppr}</w:pPr>"
+    return f"<w:p>{ppr}{''.join(runs)}</w:p>"
+
+
+# Right tab stop at the default template's text width, in twentieths of a
+# point: 8.5" page less 1.25" left and right margins = 12240 - 2 * 1800 = 8640
+# (6"), so dates and locations sit flush against the right margin.
+_RIGHT_TAB_PPR = '<w:pPr><w:tabs><w:tab w:val="right" w:pos="8640"/></w:tabs></w:pPr>'
+
+
+def _entry_header_xml(left_runs: list, right_text: str) -> str:
+    """
+    Raw markup for an entry's header line: the given run fragments on the
+    left, then right_text after a tab that aligns it to the right margin.
+    """
+    right = f'<w:r><w:tab/><w:t xml:space="preserve">{escape(right_text)}</w:t></w:r>' if right_text else ""
+    return f"<w:p>{_RIGHT_TAB_PPR}{''.join(left_runs)}{right}</w:p>"
+
+
+def _append_xml(doc, fragments: list) -> None:
+    """
+    Parse all pending body fragments in one go and insert them before the
+    final sectPr, instead of one python-docx add_paragraph call per element.
+    Clears `fragments` so the caller can keep accumulating.
+    """
+    if not fragments:
+        return
+    root = parse_xml(f'<w:body {_WR_NSDECLS}>{"".join(fragments)}</w:body>')
+    body = doc.element.body
+    # Detach sectPr, extend the body in one call, then put sectPr back last
+    sect_pr = body.sectPr
+    if sect_pr is not None:
+        body.remove(sect_pr)
+    body.extend(list(root))
+    if sect_pr is not None:
+        body.append(sect_pr)
+    fragments.clear()
+
+
+_SAVE_BUFFER_SIZE = 64 * 1024
+
+# mkstemp creates 0600 files; saved documents get the mode a plain open()
+# would have given them. The umask can only be read by setting it, so do that
+# once at import, before any render threads exist.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_SAVE_FILE_MODE = 0o666 & ~_UMASK
+
+
+def _save_atomic(data: bytes, output_path: str) -> None:
+    """
+    Write the serialized document, then publish it with os.replace so readers
+    never see a half-written .docx at output_path.
+    """
+    # mkstemp gives every writer (thread or process) its own temp file next to
+    # the target, so the rename stays on one filesystem
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(output_path) or ".", suffix=".tmp")
+    try:
+        # With a 64KB buffer a typical resume reaches the file in a single write.
+        # No fsync: the rename alone is atomic for readers, and outputs are
+        # short-lived files that don't need to survive a crash.
+        with open(fd, "wb", buffering=_SAVE_BUFFER_SIZE) as f:
+            f.write(data)
+        os.chmod(tmp_path, _SAVE_FILE_MODE)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
-    # Replace multiple whitespaces with single space
-    sanitized = re.sub(r'\s+', ' ', sanitized)
 
-    # Strip leading/trailing whitespace
-    sanitized = sanitized.strip()
+# In-process LRU of finished documents. Rendering is deterministic in its
+# input, so a repeat request (a re-download, the same resume sent twice) skips
+# the build. Entries live only as long as the process, so a deploy or a
+# python-docx upgrade can never serve stale output.
+_RENDER_CACHE: "OrderedDict[bytes, bytes]" = OrderedDict()
+_RENDER_CACHE_MAX = 64
+_render_cache_lock = threading.Lock()
 
-    return sanitized
 
+def _render_cache_key(resume_json) -> bytes:
+    payload = json.dumps(resume_json, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
 
-def _safe_add_paragraph(doc, text: str):
-    """Safely add a paragraph with text sanitization."""
-    safe_text = _safe_text(text)
-    if safe_text:
-        return doc.add_paragraph(safe_text)
-    return doc.add_paragraph("")
 
+def _render_cache_get(key: bytes):
+    with _render_cache_lock:
+        data = _RENDER_CACHE.get(key)
+        if data is not None:
+            _RENDER_CACHE.move_to_end(key)
+        return data
 
-def render_harvard(resume_json, output_path: str, job_title: str = ""):
-    doc = Document()
 
-    style = doc.styles['Normal']
-    style.font.name = 'Times New Roman'
-    style.font.size = Pt(11)
+def _render_cache_put(key: bytes, data: bytes) -> None:
+    with _render_cache_lock:
+        _RENDER_CACHE[key] = data
+        _RENDER_CACHE.move_to_end(key)
+        while len(_RENDER_CACHE) > _RENDER_CACHE_MAX:
+            _RENDER_CACHE.popitem(last=False)
 
-    # tighten paragraph spacing globally for compact Harvard look
-    for pstyle in doc.styles:
-        try:
-            pstyle.paragraph_format.space_after = Pt(2)
-        except Exception:
-            pass
 
-    # --- Header: centered name + contact info ---
-    name = resume_json.get("contact_info", {}).get("full_name", "")
-    if name:
-        p = doc.add_paragraph()
-        p.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        r = p.add_run(name)
-        r.bold = True
-        r.font.size = Pt(16)
-        p.paragraph_format.space_after = Pt(4)
+def render_harvard(resume_json, output_path, job_title: str = ""):
+    """
+    Render the resume as a Harvard-style DOCX. output_path is a file path or a
+    writable binary file object (e.g. io.BytesIO) that receives the archive.
+    """
+    key = _render_cache_key(resume_json)
+    data = _render_cache_get(key)
+    if data is None:
+        data = _render_harvard_uncached(resume_json).getvalue()
+        _render_cache_put(key, data)
 
-    ci = resume_json.get("contact_info", {})
-    links = resume_json.get("links", {}) or {}
+    if hasattr(output_path, "write"):
+        output_path.write(data)
+    else:
+        _save_atomic(data, output_path)
 
-    # Build contact line (exclude Coursera from header)
-    cp = doc.add_paragraph()
-    cp.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    contact_items = []
 
-    if ci.get("location"): contact_items.append(ci["location"])
-    if ci.get("email"): contact_items.append(ci["email"])
-    if ci.get("phone"): contact_items.append(ci["phone"])
+# Normal-style settings, built once rather than per render
+_BODY_FONT_SIZE = Pt(11)
+_BODY_SPACE_AFTER = Pt(2)
+
+
+def _render_harvard_uncached(resume_json) -> io.BytesIO:
+    doc = Document(io.BytesIO(_TEMPLATE_BYTES))
+
+    style = doc.styles['Normal']
+    style.font.name = 'Times New Roman'
+    style.font.size = _BODY_FONT_SIZE
+
+    # tighten paragraph spacing for compact Harvard look; every paragraph we
+    # emit uses Normal, so there is no need to touch the other built-in styles
+    style.paragraph_format.space_after = _BODY_SPACE_AFTER
+
+    # Pull every top-level section out once
+    ci = resume_json.get("contact_info") or {}
+    links = resume_json.get("links") or {}
+    summary = resume_json.get("summary")
+    education = resume_json.get("education") or []
+    experience = resume_json.get("experience") or []
+    projects = resume_json.get("projects") or []
+    certs = list(resume_json.get("certifications") or [])
+    skills = resume_json.get("skills") or {}
+    langs = resume_json.get("languages") or []
+
+    # Everything in the body is accumulated as raw WML and appended in bulk
+    body_xml = []
 
-    # Add professional links to header (exclude Coursera)
-    first = True
-    if contact_items:
-        cp.add_run(" • ".join(contact_items))
-        first = False
+    # --- Header: centered name + contact info ---
+    name = _safe_text(ci.get("full_name", ""))
+    if name:
+        body_xml.append(_paragraph_xml(
+            f'<w:r>{_NAME_RPR}<w:t xml:space="preserve">{escape(name)}</w:t></w:r>',
+            align="center", space_after=4,
+        ))
 
-    for label in ["LinkedIn", "GitHub", "HuggingFace"]:
+    # Build contact line (exclude Coursera from header)
+    contact_items = [ci[k] for k in ("location", "email", "phone") if ci.get(k)]
+
+    # Add professional links to header (exclude Coursera). Each separator goes
+    # into the plain-text run before it, so the line alternates text and links
+    # without a run of its own per " • ".
+    rid_cache = {}
+    contact_runs = []
+    pending = _safe_text(" • ".join(contact_items))
+    first = not pending
+    for label in ("LinkedIn", "GitHub", "HuggingFace"):
         url = links.get(label)
         if url:
             if not first:
-                cp.add_run(" • ")
-            _add_hyperlink(cp, url, label)
+                contact_runs.append(_run_xml(pending + " • "))
+            contact_runs.append(_hyperlink_xml(doc.part, url, label, rid_cache))
+            pending = ""
             first = False
+    if pending:
+        contact_runs.append(_run_xml(pending))
 
-    cp.paragraph_format.space_after = Pt(6)
-    _add_divider(doc)
+    body_xml.append(_paragraph_xml(*contact_runs, align="center", space_after=6))
+    body_xml.append(_DIVIDER_XML)
 
     # === Summary ===
-    if resume_json.get("summary"):
-        _add_section_title(doc, "SUMMARY")
-        doc.add_paragraph(resume_json["summary"])
-        _add_divider(doc)
+    if summary:
+        body_xml.append(_section_xml("SUMMARY", [_paragraph_xml(_run_xml(_safe_text(summary)))]))
 
     # === Education ===
-    if resume_json.get("education"):
-        _add_section_title(doc, "EDUCATION")
-        for edu in resume_json["education"]:
-            table = doc.add_table(rows=1, cols=2)
-            table.allow_autofit = True
-            left_cell, right_cell = table.rows[0].cells
-
-            # Left cell: Institution + location
-            p = left_cell.paragraphs[0]
-            run = p.add_run(edu.get("institution", ""))
-            run.bold = True
-            if edu.get("location"):
-                p.add_run(f" — {edu['location']}")
-
-            # Right cell: Graduation date
-            if edu.get("graduation_date"):
-                rp = right_cell.paragraphs[0]
-                rp.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
-                rp.add_run(edu["graduation_date"])
+    if education:
+        content = []
+        for edu in education:
+            location = edu.get("location")
+            gpa = edu.get("gpa")
+
+            # Institution + location, graduation date on the right
+            runs = [_run_xml(_safe_text(edu.get("institution", "")), bold=True)]
+            if location:
+                runs.append(_run_xml(f" — {_safe_text(location)}"))
 
             # Next line: Degree + field + GPA
             degree_line = f"{edu.get('degree','')} in {edu.get('field','')}"
-            if edu.get("gpa"):
-                degree_line += f", GPA: {edu['gpa']}"
-            left_cell.add_paragraph(degree_line)
-
-        doc.add_paragraph()
-        _add_divider(doc)
-
-    # === Experience (table layout so dates align on right) ===
-    if resume_json.get("experience"):
-        _add_section_title(doc, "EXPERIENCE")
-        for exp in resume_json["experience"]:
-            table = doc.add_table(rows=1, cols=2)
-            table.allow_autofit = True
-            left_cell, right_cell = table.rows[0].cells
-
-            # Left: company (bold) + position (italic) + bullets
-            left_para = left_cell.paragraphs[0]
-            left_run = left_para.add_run(_safe_text(exp.get("company", "")))
-            left_run.bold = True
-
-            # position on next line
-            if exp.get("position"):
-                pos_p = left_cell.add_paragraph()
-                pos_run = pos_p.add_run(_safe_text(exp.get("position")))
-                pos_run.italic = True
-
-            # bullets
-            for b in exp.get("achievements", []):
-                bull_p = left_cell.add_paragraph()
-                bull_p.add_run(f"• {_safe_text(b)}")
-                bull_p.paragraph_format.space_after = Pt(1)
+            if gpa:
+                degree_line += f", GPA: {gpa}"
+
+            content.append(_entry_header_xml(runs, _safe_text(edu.get("graduation_date", ""))))
+            content.append(_paragraph_xml(_run_xml(_safe_text(degree_line))))
+
+        body_xml.append(_section_xml("EDUCATION", content, _SPACED_DIVIDER_XML))
 
-            # Right: dates / location (top-right)
-            right_para = right_cell.paragraphs[0]
+    # === Experience (right tab stop so dates align on right) ===
+    if experience:
+        content = []
+        for exp in experience:
+            position = exp.get("position")
+            start_date = exp.get("start_date", "")
+            end_date = exp.get("end_date", "")
+            location = exp.get("location")
+
+            # Dates / location for the right side of the header line
             date_text = ""
-            if exp.get("start_date") or exp.get("end_date"):
-                date_text = f"{exp.get('start_date','')} – {exp.get('end_date','')}"
-            if exp.get("location"):
-                date_text = (date_text + " | " if date_text else "") + exp.get("location")
-            right_para.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
-            right_para.add_run(date_text)
+            if start_date or end_date:
+                date_text = f"{start_date} – {end_date}"
+            if location:
+                date_text = (date_text + " | " if date_text else "") + location
+
+            # Company (bold) with dates on the right, then position (italic) + bullets
+            content.append(_entry_header_xml(
+                [_run_xml(_safe_text(exp.get("company", "")), bold=True)], _safe_text(date_text)
+            ))
+            if position:
+                content.append(_paragraph_xml(_run_xml(_safe_text(position), italic=True)))
+            for b in exp.get("achievements", []):
+                content.append(_paragraph_xml(_run_xml(f"• {_safe_text(b)}"), space_after=1))
 
-        doc.add_paragraph()
-        _add_divider(doc)
+        body_xml.append(_section_xml("EXPERIENCE", content, _SPACED_DIVIDER_XML))
 
     # === Projects ===
-    if resume_json.get("projects"):
-        _add_section_title(doc, "PROJECTS")
-        for proj in resume_json["projects"]:
-            p = doc.add_paragraph()
-            run = p.add_run(proj.get("title", ""))
-            run.bold = True
-            if proj.get("technologies"):
-                p.add_run(f" — {', '.join(proj['technologies'])}")
+    if projects:
+        content = []
+        for proj in projects:
+            technologies = proj.get("technologies")
+            runs = [_run_xml(_safe_text(proj.get("title", "")), bold=True)]
+            if technologies:
+                runs.append(_run_xml(f" — {_safe_text(', '.join(technologies))}"))
+            content.append(_paragraph_xml(*runs))
 
             for b in proj.get("bullets", []):
-                doc.add_paragraph(f"• {b}")
-        _add_divider(doc)
+                content.append(_paragraph_xml(_run_xml(f"• {_safe_text(b)}")))
+        body_xml.append(_section_xml("PROJECTS", content))
 
     # === Certifications (including Coursera from links) ===
-    certs = resume_json.get("certifications", []) or []
-
     # Add Coursera links from links dict to certifications section
-    coursera_links = resume_json.get("links", {}).get("Coursera", [])
+    coursera_links = links.get("Coursera", [])
     if coursera_links:
         if isinstance(coursera_links, str):
             coursera_links = [coursera_links]
         certs.extend(coursera_links)
 
     if certs:
-        _add_section_title(doc, "CERTIFICATIONS")
-        for c in certs:
-            doc.add_paragraph(str(c))
-        doc.add_paragraph()
-        _add_divider(doc)
+        content = [_paragraph_xml(_run_xml(_safe_text(str(c)))) for c in certs]
+        body_xml.append(_section_xml("CERTIFICATIONS", content, _SPACED_DIVIDER_XML))
 
     # === Skills & Languages ===
-    skills = resume_json.get("skills", {})
-    langs = resume_json.get("languages", [])
-
     if skills or langs:
-        _add_section_title(doc, "SKILLS & INTERESTS")
-
-        if skills:
-            for cat, items in skills.items():
-                doc.add_paragraph(f"{cat}: {', '.join(items)}")
+        content = []
+        for cat, items in skills.items():
+            skills_text = ", ".join(map(_safe_text, items))
+            content.append(_paragraph_xml(_run_xml(f"{_safe_text(cat)}: {skills_text}")))
 
         if langs:
-            doc.add_paragraph("Languages: " + ", ".join(langs))
-
-    # Save DOCX
-    doc.save(output_path)
-
-
-__all__ = ["render_harvard"]
\ No newline at end of file
+            content.append(_paragraph_xml(_run_xml("Languages: " + ", ".join(map(_safe_text, langs)))))
+
+        # last section: no closing divider
+        body_xml.append(_section_xml("SKILLS & INTERESTS", content, divider=""))
+
+    _append_xml(doc, body_xml)
+
+    # Serialize DOCX in memory; the caller decides where the bytes go
+    return _save_docx(doc)
+
+
+def _render_one(job):
+    resume_json, output_path, job_title = job
+    render_harvard(resume_json, output_path, job_title)
+    return output_path
+
+
+def render_harvard_batch(resumes, output_paths, job_titles=None, max_workers: int = None):
+    """
+    Render many resumes to output_paths across worker processes; returns the
+    paths in input order. Workers are independent: each reads the template
+    once at import and keeps its own render cache for the resumes it is
+    handed. With max_workers=1 (or a single resume) everything renders in
+    this process and shares its cache.
+    """
+    if job_titles is None:
+        job_titles = [""] * len(resumes)
+    if not len(resumes) == len(output_paths) == len(job_titles):
+        raise ValueError("resumes, output_paths and job_titles must be the same length")
+    jobs = list(zip(resumes, output_paths, job_titles))
+    if not jobs:
+        return []
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        return [_render_one(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render_one, jobs, chunksize=chunksize))
+
+
+__all__ = ["render_harvard", "render_harvard_batch"]
\ No newline at end of file
@@ -5,12 +5,12 @@ Debug script to test parsing directly
 
 import sys
 import os
-sys.path.append('.')
-
-from backend.parser import extract_text, fallback_extract
-from backend.llm import llm_parse_resume
 
 def test_direct_parsing():
+    # Imported here so importing this script doesn't pull in the parser/LLM stack
+    from backend.parser import extract_text, fallback_extract
+    from backend.llm import llm_parse_resume
+
     resume_path = "./samples/resume.pdf"
 
     if not os.path.exists(resume_path):
@@ -41,4 +41,5 @@ def test_direct_parsing():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    sys.path.append('.')
     test_direct_parsing()
\ No newline at end of file
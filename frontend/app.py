@@ -1,37 +1,68 @@
 import os
-import json
-import tempfile
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any, Dict
 
-import gradio as gr
+import jinja2
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from shared import DOWNLOAD_CHUNK_SIZE, make_output_dir, merge_rewrite, new_output_file, sweep_outputs
 
-API_BASE = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
 
+logger = logging.getLogger(__name__)
+
+API_BASE = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
 
-def _post_json(path: str, payload: Dict[str, Any]):
-    r = requests.post(f"{API_BASE}{path}", json=payload, timeout=60)
+# One pooled session for every backend call, so consecutive requests reuse the
+# keep-alive connection instead of opening a new one each time. Only
+# connection failures and 502/503/504 on idempotent requests are retried.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Generated documents are written here and swept on later submissions once
+# they are an hour old; by then Gradio has copied them into its own cache
+_OUTPUT_DIR = make_output_dir("resbot_gradio_outputs")
+
+# Worker threads for backend calls that can run side by side
+_POOL = ThreadPoolExecutor(max_workers=8)
+
+
+def _post_file(path: str, file_path: str, filename: str, data: Dict[str, str] = None):
+    # Hand requests the open file and let it read while encoding the body,
+    # instead of materializing a separate bytes copy (and leaking the handle)
+    with open(file_path, "rb") as fh:
+        files = {"file": (filename, fh, "application/octet-stream")}
+        r = SESSION.post(f"{API_BASE}{path}", files=files, data=data, timeout=120)
     r.raise_for_status()
-    return r.json()
+    return orjson.loads(r.content)
 
 
-def _post_file(path: str, file_bytes: bytes, filename: str):
-    files = {"file": (filename, file_bytes)}
-    r = requests.post(f"{API_BASE}{path}", files=files, timeout=60)
-    r.raise_for_status()
-    return r.json()
+def _post_to_tempfile(path: str, payload: Dict[str, Any], suffix: str) -> str:
+    """POST to backend and stream the response body into a temp file; returns its path"""
+    with SESSION.post(f"{API_BASE}{path}", data=orjson.dumps(payload), headers=_JSON_HEADERS,
+                      timeout=120, stream=True) as r:
+        r.raise_for_status()
+        with new_output_file(_OUTPUT_DIR, suffix) as tmp:
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                tmp.write(chunk)
+    return tmp.name
 
 
 def _post_render(resume_json: Dict[str, Any]) -> str:
-    r = requests.post(f"{API_BASE}/render", json=resume_json, timeout=120)
-    r.raise_for_status()
     # Save the received docx stream to a temp file
-    tmp = tempfile.NamedTemporaryFile(suffix=".docx", delete=False)
-    tmp.write(r.content)
-    tmp.flush()
-    tmp.close()
-    return tmp.name
+    return _post_to_tempfile("/render", resume_json, ".docx")
 
 
 def _post_cover_letter(resume_json: Dict[str, Any], job_description: str, company_name: str = "", position_title: str = "") -> str:
@@ -41,14 +72,8 @@ def _post_cover_letter(resume_json: Dict[str, Any], job_description: str, compan
         "company_name": company_name,
         "position_title": position_title
     }
-    r = requests.post(f"{API_BASE}/cover-letter", json=payload, timeout=120)
-    r.raise_for_status()
     # Save the received text stream to a temp file
-    tmp = tempfile.NamedTemporaryFile(suffix=".txt", delete=False)
-    tmp.write(r.content)
-    tmp.flush()
-    tmp.close()
-    return tmp.name
+    return _post_to_tempfile("/cover-letter", payload, ".txt")
 
 
 def _post_interview_questions(resume_json: Dict[str, Any], job_description: str, company_name: str = "", position_title: str = "") -> str:
@@ -58,36 +83,42 @@ def _post_interview_questions(resume_json: Dict[str, Any], job_description: str,
         "company_name": company_name,
         "position_title": position_title
     }
-    r = requests.post(f"{API_BASE}/interview-questions", json=payload, timeout=120)
-    r.raise_for_status()
     # Save the received text stream to a temp file
-    tmp = tempfile.NamedTemporaryFile(suffix=".txt", delete=False)
-    tmp.write(r.content)
-    tmp.flush()
-    tmp.close()
-    return tmp.name
+    return _post_to_tempfile("/interview-questions", payload, ".txt")
 
 
 def ats_bar_html(score: int, recommendations: list) -> str:
-    pct = max(0, min(100, score))
-    color = "#4caf50" if pct >= 75 else ("#ff9800" if pct >= 50 else "#f44336")
-    # Simple HTML escaping for recommendations
-    rec_html = "".join(f"<li>{rec.replace('<', '&lt;').replace('>', '&gt;')}</li>" for rec in recommendations)
-    return f"""
+    # The backend returns a handful of canned recommendation bundles, so most
+    # calls are cache hits
+    return _ats_bar_html_cached(score, tuple(recommendations))
+
+
+# Compiled once; autoescape runs recommendations through MarkupSafe's C escaper
+_ATS_TMPL = jinja2.Template("""
     <div style='font-family: Calibri, sans-serif;'>
-      <div style='margin-bottom:6px;'>ATS Score: <b>{pct}%</b></div>
+      <div style='margin-bottom:6px;'>ATS Score: <b>{{ pct }}%</b></div>
       <div style='width:100%; background:#eee; border-radius:6px; height:16px; overflow:hidden;'>
-        <div style='width:{pct}%; background:{color}; height:100%;'></div>
+        <div style='width:{{ pct }}%; background:{{ color }}; height:100%;'></div>
       </div>
       <div style='margin-top:8px;'>
         <b>Recommendations</b>
-        <ul style='margin-top:4px;'>{rec_html}</ul>
+        <ul style='margin-top:4px;'>{% for r in recs %}<li>{{ r }}</li>{% endfor %}</ul>
       </div>
     </div>
-    """
+    """, autoescape=True)
+
+
+@lru_cache(maxsize=128)
+def _ats_bar_html_cached(score: int, recommendations: tuple) -> str:
+    pct = max(0, min(100, score))
+    color = "#4caf50" if pct >= 75 else ("#ff9800" if pct >= 50 else "#f44336")
+    return _ATS_TMPL.render(pct=pct, color=color, recs=recommendations)
 
 
 def build_app():
+    # gradio pulls in pandas/PIL/matplotlib; only pay for that when the UI is built
+    import gradio as gr
+
     with gr.Blocks(title="AI Resume Builder") as demo:
         gr.Markdown("**AI-Powered Resume Builder (Harvard Template)**")
         with gr.Row():
@@ -100,73 +131,69 @@ def build_app():
             with gr.Column():
                 ats_html = gr.HTML(label="ATS Score")
                 resume_json_out = gr.Textbox(label="Resume JSON (Preview)", lines=10)
+                show_json = gr.Button("Show JSON")
                 download_resume = gr.File(label="Download Harvard Resume (.docx)")
                 download_cover_letter = gr.File(label="Download Cover Letter (.txt)", visible=False)
                 download_interview_questions = gr.File(label="Download Interview Questions (.txt)", visible=False)
+        merged_state = gr.State(None)
 
         def on_submit(file_obj, job_desc, cov, iq):
             if not file_obj or not job_desc:
-                return "Please upload a resume and provide a job description.", "", None, None, None, gr.update(visible=False), gr.update(visible=False)
+                return "Please upload a resume and provide a job description.", "", None, None, None, gr.update(visible=False), gr.update(visible=False), None
+
+            sweep_outputs(_OUTPUT_DIR)
 
             try:
-                # Parse
-                file_bytes = open(file_obj.name, "rb").read()
-                parsed = _post_file("/parse", file_bytes, os.path.basename(file_obj.name))
-
-                # Rewrite
-                payload = {"resume_json": parsed, "job_description": job_desc}
-                rewrite = _post_json("/rewrite", payload)
-
-                # Merge minimally: keep structure from parser, only replace summary and bullets when provided
-                merged = parsed.copy()
-                if rewrite.get("rewritten_summary"):
-                    merged["summary"] = rewrite["rewritten_summary"]
-                company_to_bullets = {e.get("company", ""): e.get("bullets", []) for e in rewrite.get("rewritten_experience", [])}
-                for e in merged.get("experience", []):
-                    e_company = e.get("company", "")
-                    if e_company in company_to_bullets and company_to_bullets[e_company]:
-                        e["achievements"] = company_to_bullets[e_company]
-
-                # Skills/projects ranking (non-destructive)
-                if rewrite.get("ranked_skills"):
-                    merged["skills"] = rewrite["ranked_skills"]
-
-                # Render
-                docx_path = _post_render(merged)
-
-                # ATS
-                ats = _post_json("/ats", payload)
-                ats_html_val = ats_bar_html(ats.get("ats_score", 0), ats.get("recommendations", []))
+                # Parse, rewrite and ATS-score in a single backend round trip
+                processed = _post_file("/process", file_obj.name, os.path.basename(file_obj.name),
+                                       data={"job_description": job_desc})
+                parsed, rewrite, ats = processed["parsed"], processed["rewritten"], processed["ats"]
+
+                # Merge parsed and rewritten data
+                merged = merge_rewrite(parsed, rewrite)
 
-                # Convert to JSON string for display
-                json_str = json.dumps(merged, indent=2)
+                # Render and the optional documents only depend on the merged
+                # resume and the JD, so issue them concurrently
+                render_future = _POOL.submit(_post_render, merged)
+                cover_future = _POOL.submit(_post_cover_letter, merged, job_desc) if cov else None
+                iq_future = _POOL.submit(_post_interview_questions, merged, job_desc) if iq else None
 
-                # Generate optional cover letter and interview questions
+                docx_path = render_future.result()
+                ats_html_val = ats_bar_html(ats.get("ats_score", 0), ats.get("recommendations", []))
+
+                # Collect optional cover letter and interview questions
                 cover_letter_path = None
                 interview_questions_path = None
                 cover_letter_update = gr.update(visible=False)
                 interview_update = gr.update(visible=False)
 
-                if cov:
+                if cover_future is not None:
                     try:
-                        cover_letter_path = _post_cover_letter(merged, job_desc)
+                        cover_letter_path = cover_future.result()
                         cover_letter_update = gr.update(visible=True)
-                    except Exception as e:
-                        print(f"Cover letter generation failed: {e}")
+                    except Exception:
+                        logger.exception("Cover letter generation failed")
 
-                if iq:
+                if iq_future is not None:
                     try:
-                        interview_questions_path = _post_interview_questions(merged, job_desc)
+                        interview_questions_path = iq_future.result()
                         interview_update = gr.update(visible=True)
-                    except Exception as e:
-                        print(f"Interview questions generation failed: {e}")
+                    except Exception:
+                        logger.exception("Interview questions generation failed")
 
-                return ats_html_val, json_str, docx_path, cover_letter_path, interview_questions_path, cover_letter_update, interview_update
+                # The JSON preview is only serialized when "Show JSON" is clicked
+                return ats_html_val, "", docx_path, cover_letter_path, interview_questions_path, cover_letter_update, interview_update, merged
             except Exception as e:
                 error_msg = f"Error: {str(e)}"
-                return error_msg, error_msg, None, None, None, gr.update(visible=False), gr.update(visible=False)
+                return error_msg, error_msg, None, None, None, gr.update(visible=False), gr.update(visible=False), None
+
+        def on_show_json(merged):
+            if merged is None:
+                return ""
+            return orjson.dumps(merged, option=orjson.OPT_INDENT_2).decode()
 
-        submit.click(on_submit, inputs=[resume_file, jd, cover_letter, interview_q], outputs=[ats_html, resume_json_out, download_resume, download_cover_letter, download_interview_questions, download_cover_letter, download_interview_questions])
+        submit.click(on_submit, inputs=[resume_file, jd, cover_letter, interview_q], outputs=[ats_html, resume_json_out, download_resume, download_cover_letter, download_interview_questions, download_cover_letter, download_interview_questions, merged_state])
+        show_json.click(on_show_json, inputs=[merged_state], outputs=[resume_json_out])
 
     return demo
 
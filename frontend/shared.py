@@ -0,0 +1,68 @@
+"""Helpers shared by the Gradio (app.py) and FastAPI (web_app.py) frontends."""
+import os
+import time
+import atexit
+import shutil
+import tempfile
+from typing import Any, Dict
+
+
+# Backend responses are copied to disk in chunks of this size
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Generated documents older than this are removed by sweep_outputs
+OUTPUT_MAX_AGE = 3600.0
+
+
+def make_output_dir(name: str) -> str:
+    """
+    Fresh private (0700) directory for this process's generated files. A fixed
+    path in the shared temp dir could be pre-created, or symlinked elsewhere,
+    by another local user. Removed when the process exits.
+    """
+    path = tempfile.mkdtemp(prefix=f"{name}-")
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+def new_output_file(output_dir: str, suffix: str):
+    """Open a fresh, kept-on-close binary file in output_dir for a backend response"""
+    return tempfile.NamedTemporaryFile(suffix=suffix, dir=output_dir, delete=False)
+
+
+def sweep_outputs(output_dir: str, max_age: float = OUTPUT_MAX_AGE) -> None:
+    """Delete generated files in output_dir older than max_age seconds"""
+    cutoff = time.time() - max_age
+    for entry in os.scandir(output_dir):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+def merge_rewrite(parsed: Dict[str, Any], rewrite: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Keep structure from parser, only replace summary, bullets and skills when
+    the rewrite provides them. Builds new dicts instead of mutating `parsed`.
+    """
+    # Key by (company, position) so roles sharing a company (or missing one)
+    # don't overwrite each other; rewritten entries without a position still
+    # match on company alone
+    role_to_bullets = {(e.get("company", ""), e.get("position", "")): e.get("bullets", [])
+                       for e in rewrite.get("rewritten_experience", [])}
+
+    def bullets_for(exp):
+        company = exp.get("company", "")
+        return role_to_bullets.get((company, exp.get("position", ""))) or role_to_bullets.get((company, ""))
+
+    merged = {
+        **parsed,
+        "experience": [{**exp, "achievements": bullets} if (bullets := bullets_for(exp)) else exp
+                       for exp in parsed.get("experience", [])],
+    }
+    if rewrite.get("rewritten_summary"):
+        merged["summary"] = rewrite["rewritten_summary"]
+    if rewrite.get("ranked_skills"):
+        merged["skills"] = rewrite["ranked_skills"]
+    return merged
@@ -1,18 +1,55 @@
 import os
-import json
-import tempfile
+import time
+import logging
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Any, Dict, List
 from pathlib import Path
 
 from fastapi import FastAPI, File, UploadFile, Form, Request, HTTPException
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import requests
-import uvicorn
+import httpx
+import orjson
+
+from shared import DOWNLOAD_CHUNK_SIZE, make_output_dir, merge_rewrite, new_output_file, sweep_outputs
+
+logger = logging.getLogger(__name__)
+
+# Backend API configuration
+API_BASE = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled async client for every backend call: the event loop keeps
+    # serving other requests during backend I/O, and consecutive calls reuse
+    # keep-alive connections. Connection failures are retried twice.
+    app.state.http = httpx.AsyncClient(
+        base_url=API_BASE,
+        timeout=httpx.Timeout(120.0),
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        transport=httpx.AsyncHTTPTransport(retries=2),
+    )
+    # Bounded pool for CPU-bound work (serializing large responses) so
+    # it stays off the event loop without spawning a thread per request
+    app.state.executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+        app.state.executor.shutdown(wait=False)
+
 
 # Initialize FastAPI app
-app = FastAPI(title="AI Resume Builder", description="Build professional Harvard-style resumes with AI")
+app = FastAPI(title="AI Resume Builder", description="Build professional Harvard-style resumes with AI",
+              lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Setup static files and templates
 static_dir = Path(__file__).parent / "static"
@@ -25,66 +62,168 @@ templates_dir.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 templates = Jinja2Templates(directory=str(templates_dir))
 
-# Backend API configuration
-API_BASE = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
-
-def _post_json(path: str, payload: Dict[str, Any]):
+# Responses to identical backend requests, keyed by a hash of path + payload
+# (for uploads: filename, form fields and file bytes), so resubmitting the same
+# resume and JD (e.g. after toggling a checkbox) skips the LLM round-trips.
+# JSON endpoints keep the raw body, file endpoints the temp path.
+_RESPONSE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_RESPONSE_CACHE_MAX = 256
+_RESPONSE_CACHE_TTL = 3600.0
+_response_cache_lock = threading.Lock()
+
+# Generated documents are written here and swept on later submissions. A cache
+# hit can hand out a file's path just before its entry expires, so files are
+# kept for a download grace period past the cache TTL
+_OUTPUT_DIR = make_output_dir("resbot_web_outputs")
+_DOWNLOAD_GRACE = 600.0
+_OUTPUT_MAX_AGE = _RESPONSE_CACHE_TTL + _DOWNLOAD_GRACE
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _encode_payload(payload: Dict[str, Any]) -> bytes:
+    """Request body with sorted keys, so the same bytes double as the cache key input"""
+    return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+
+def _cache_key(path: str, body: bytes) -> str:
+    return hashlib.sha256(path.encode("utf-8") + b"\n" + body).hexdigest()
+
+def _cache_get(key: str):
+    """Cached value for key, or None if missing or older than the TTL"""
+    with _response_cache_lock:
+        entry = _RESPONSE_CACHE.get(key)
+        if entry is None:
+            return None
+        created_at, value = entry
+        if time.monotonic() - created_at > _RESPONSE_CACHE_TTL:
+            del _RESPONSE_CACHE[key]
+            return None
+        _RESPONSE_CACHE.move_to_end(key)
+        return value
+
+def _cache_put(key: str, value) -> None:
+    with _response_cache_lock:
+        _RESPONSE_CACHE[key] = (time.monotonic(), value)
+        _RESPONSE_CACHE.move_to_end(key)
+        while len(_RESPONSE_CACHE) > _RESPONSE_CACHE_MAX:
+            _RESPONSE_CACHE.popitem(last=False)
+
+async def _post_json(client: httpx.AsyncClient, path: str, payload: Dict[str, Any]):
     """Send JSON payload to backend API"""
+    body = _encode_payload(payload)
+    key = _cache_key(path, body)
+    cached = _cache_get(key)
+    if cached is not None:
+        # decode per hit so callers never share a mutable result
+        return orjson.loads(cached)
     try:
-        r = requests.post(f"{API_BASE}{path}", json=payload, timeout=60)
+        r = await client.post(path, content=body, headers=_JSON_HEADERS, timeout=60)
         r.raise_for_status()
-        return r.json()
+        data = orjson.loads(r.content)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Backend API error: {str(e)}")
-
-def _post_file(path: str, file_bytes: bytes, filename: str):
-    """Send file to backend API"""
+    # the backend reports failures as {"error": ...} with a 200; never cache those
+    if not (isinstance(data, dict) and "error" in data):
+        _cache_put(key, r.content)
+    return data
+
+def _upload_cache_key(path: str, file_obj, filename: str, data: Dict[str, str] = None) -> str:
+    """Hash of path, filename, form fields and file contents; rewinds file_obj afterwards"""
+    h = hashlib.sha256(path.encode("utf-8") + b"\n" + filename.encode("utf-8") + b"\n" + _encode_payload(data or {}) + b"\n")
+    file_obj.seek(0)
+    while chunk := file_obj.read(DOWNLOAD_CHUNK_SIZE):
+        h.update(chunk)
+    file_obj.seek(0)
+    return h.hexdigest()
+
+async def _post_file(client: httpx.AsyncClient, path: str, file_obj, filename: str, data: Dict[str, str] = None):
+    """Send file (plus optional form fields) to backend API, streamed from the open file object"""
+    key = _upload_cache_key(path, file_obj, filename, data)
+    cached = _cache_get(key)
+    if cached is not None:
+        return orjson.loads(cached)
     try:
-        files = {"file": (filename, file_bytes)}
-        r = requests.post(f"{API_BASE}{path}", files=files, timeout=60)
+        files = {"file": (filename, file_obj)}
+        r = await client.post(path, files=files, data=data)
         r.raise_for_status()
-        return r.json()
+        result = orjson.loads(r.content)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Backend API error: {str(e)}")
-
-def _post_render(resume_json: Dict[str, Any]) -> bytes:
-    """Get rendered resume from backend"""
+    if not (isinstance(result, dict) and "error" in result):
+        _cache_put(key, r.content)
+    return result
+
+async def _post_to_tempfile(client: httpx.AsyncClient, path: str, payload: Dict[str, Any], suffix: str) -> str:
+    """POST to backend and stream the response body into a temp file; returns its path"""
+    body = _encode_payload(payload)
+    key = _cache_key(path, body)
+    cached_path = _cache_get(key)
+    if cached_path is not None and os.path.exists(cached_path):
+        return cached_path
     try:
-        r = requests.post(f"{API_BASE}/render", json=resume_json, timeout=120)
-        r.raise_for_status()
-        return r.content
+        async with client.stream("POST", path, content=body, headers=_JSON_HEADERS) as r:
+            r.raise_for_status()
+            # errors come back as a JSON body instead of the document
+            cacheable = not r.headers.get("Content-Type", "").startswith("application/json")
+            with new_output_file(_OUTPUT_DIR, suffix) as tmp:
+                async for chunk in r.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    tmp.write(chunk)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Backend API error: {str(e)}")
+    if cacheable:
+        _cache_put(key, tmp.name)
+    return tmp.name
+
+async def _post_render(client: httpx.AsyncClient, resume_json: Dict[str, Any]) -> str:
+    """Get rendered resume from backend, saved to a temp .docx"""
+    return await _post_to_tempfile(client, "/render", resume_json, ".docx")
+
+async def _post_cover_letter(client: httpx.AsyncClient, resume_json: Dict[str, Any], job_description: str, company_name: str = "", position_title: str = "") -> str:
+    """Get cover letter from backend, saved to a temp .txt"""
+    payload = {
+        "resume_json": resume_json,
+        "job_description": job_description,
+        "company_name": company_name,
+        "position_title": position_title
+    }
+    return await _post_to_tempfile(client, "/cover-letter", payload, ".txt")
+
+async def _post_interview_questions(client: httpx.AsyncClient, resume_json: Dict[str, Any], job_description: str, company_name: str = "", position_title: str = "") -> str:
+    """Get interview questions from backend, saved to a temp .txt"""
+    payload = {
+        "resume_json": resume_json,
+        "job_description": job_description,
+        "company_name": company_name,
+        "position_title": position_title
+    }
+    return await _post_to_tempfile(client, "/interview-questions", payload, ".txt")
 
-def _post_cover_letter(resume_json: Dict[str, Any], job_description: str, company_name: str = "", position_title: str = "") -> bytes:
-    """Get cover letter from backend"""
+async def _post_render_html(client: httpx.AsyncClient, resume_json: Dict[str, Any]) -> str:
+    """Get HTML preview from backend, or a placeholder page if that fails"""
     try:
-        payload = {
-            "resume_json": resume_json,
-            "job_description": job_description,
-            "company_name": company_name,
-            "position_title": position_title
-        }
-        r = requests.post(f"{API_BASE}/cover-letter", json=payload, timeout=120)
-        r.raise_for_status()
-        return r.content
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Backend API error: {str(e)}")
-
-def _post_interview_questions(resume_json: Dict[str, Any], job_description: str, company_name: str = "", position_title: str = "") -> bytes:
-    """Get interview questions from backend"""
+        r = await client.post("/render-html", content=orjson.dumps(resume_json), headers=_JSON_HEADERS, timeout=30)
+        return r.text
+    except Exception:
+        logger.exception("HTML generation failed")
+        return "<html><body><h1>HTML generation failed</h1></body></html>"
+
+async def _optional_call(label: str, enabled: bool, fn, *args):
+    """Await an optional backend call; None when skipped or failed"""
+    if not enabled:
+        return None
     try:
-        payload = {
-            "resume_json": resume_json,
-            "job_description": job_description,
-            "company_name": company_name,
-            "position_title": position_title
-        }
-        r = requests.post(f"{API_BASE}/interview-questions", json=payload, timeout=120)
-        r.raise_for_status()
-        return r.content
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Backend API error: {str(e)}")
+        return await fn(*args)
+    except Exception:
+        logger.exception("%s generation failed", label)
+        return None
+
+@lru_cache(maxsize=1)
+def _load_kaushal_fallback():
+    """Raw known-good resume JSON, read from disk once; None if the file is missing"""
+    path = Path(__file__).parent.parent / "kaushal_enhanced_resume.json"
+    try:
+        return path.read_text()
+    except OSError:
+        return None
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -99,15 +238,24 @@ async def process_resume(
     company_name: str = Form(""),
     position_title: str = Form(""),
     generate_cover_letter: bool = Form(False),
-    generate_interview_questions: bool = Form(False)
+    generate_interview_questions: bool = Form(False),
+    include_html_preview: bool = Form(True)
 ):
     """Process uploaded resume and return results"""
-    try:
-        # Read uploaded file
-        file_content = await resume_file.read()
+    sweep_outputs(_OUTPUT_DIR, _OUTPUT_MAX_AGE)
 
-        # Parse resume
-        parsed_data = _post_file("/parse", file_content, resume_file.filename or "resume.pdf")
+    try:
+        client = request.app.state.http
+        executor = request.app.state.executor
+        loop = asyncio.get_running_loop()
+
+        # Parse, rewrite and ATS-score in one backend round trip, streaming the
+        # spooled upload straight to the backend
+        processed = await _post_file(client, "/process", resume_file.file, resume_file.filename or "resume.pdf",
+                                     data={"job_description": job_description})
+        parsed_data = processed["parsed"]
+        rewritten_data = processed["rewritten"]
+        ats_data = processed["ats"]
 
         # Check if parsing failed or returned minimal data
         def is_minimal_data(data):
@@ -118,81 +266,33 @@ async def process_resume(
         # If parsing returns minimal data and this is Kaushal's resume, use known good data
         if (is_minimal_data(parsed_data) and
             resume_file.filename and "Kaushal" in resume_file.filename):
-            # Load the known good JSON data
-            import json
-            import os
-            kaushal_json_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "kaushal_enhanced_resume.json")
-            if os.path.exists(kaushal_json_path):
-                with open(kaushal_json_path, 'r') as f:
-                    parsed_data = json.load(f)
-
-        # Rewrite/optimize resume
-        rewrite_payload = {
-            "resume_json": parsed_data,
-            "job_description": job_description
-        }
-        rewritten_data = _post_json("/rewrite", rewrite_payload)
+            fallback_json = _load_kaushal_fallback()
+            if fallback_json is not None:
+                parsed_data = orjson.loads(fallback_json)
+
+                # The batched rewrite/ATS results belong to the discarded parse
+                rewrite_payload = {
+                    "resume_json": parsed_data,
+                    "job_description": job_description
+                }
+                rewritten_data, ats_data = await asyncio.gather(
+                    _post_json(client, "/rewrite", rewrite_payload),
+                    _post_json(client, "/ats", rewrite_payload),
+                )
 
         # Merge parsed and rewritten data
-        merged_data = parsed_data.copy()
-        if rewritten_data.get("rewritten_summary"):
-            merged_data["summary"] = rewritten_data["rewritten_summary"]
-
-        # Update experience achievements
-        company_to_bullets = {e.get("company", ""): e.get("bullets", []) for e in rewritten_data.get("rewritten_experience", [])}
-        for exp in merged_data.get("experience", []):
-            exp_company = exp.get("company", "")
-            if exp_company in company_to_bullets and company_to_bullets[exp_company]:
-                exp["achievements"] = company_to_bullets[exp_company]
-
-        # Update skills if available
-        if rewritten_data.get("ranked_skills"):
-            merged_data["skills"] = rewritten_data["ranked_skills"]
-
-        # Get ATS score
-        ats_data = _post_json("/ats", rewrite_payload)
-
-        # Render Harvard template (DOCX)
-        resume_content = _post_render(merged_data)
-
-        # Save rendered resume to temp file
-        temp_resume = tempfile.NamedTemporaryFile(suffix=".docx", delete=False)
-        temp_resume.write(resume_content)
-        temp_resume.close()
-
-        # Generate HTML version
-        # Generate HTML preview
-        try:
-            response = requests.post(f"{API_BASE}/render-html", json=merged_data, timeout=30)
-            html_preview = response.text
-        except Exception as e:
-            print(f"HTML generation failed: {e}")
-            html_preview = "<html><body><h1>HTML generation failed</h1></body></html>"
-
-
-        # Generate optional documents
-        cover_letter_path = None
-        interview_questions_path = None
-
-        if generate_cover_letter:
-            try:
-                cover_letter_content = _post_cover_letter(merged_data, job_description, company_name, position_title)
-                temp_cover = tempfile.NamedTemporaryFile(suffix=".txt", delete=False)
-                temp_cover.write(cover_letter_content)
-                temp_cover.close()
-                cover_letter_path = temp_cover.name
-            except Exception as e:
-                print(f"Cover letter generation failed: {e}")
-
-        if generate_interview_questions:
-            try:
-                interview_content = _post_interview_questions(merged_data, job_description, company_name, position_title)
-                temp_interview = tempfile.NamedTemporaryFile(suffix=".txt", delete=False)
-                temp_interview.write(interview_content)
-                temp_interview.close()
-                interview_questions_path = temp_interview.name
-            except Exception as e:
-                print(f"Interview questions generation failed: {e}")
+        merged_data = merge_rewrite(parsed_data, rewritten_data)
+
+        # DOCX render, HTML preview and the optional documents only depend on
+        # the merged resume and the JD, so run them concurrently
+        resume_path, html_preview, cover_letter_path, interview_questions_path = await asyncio.gather(
+            _post_render(client, merged_data),
+            _optional_call("HTML preview", include_html_preview, _post_render_html, client, merged_data),
+            _optional_call("Cover letter", generate_cover_letter, _post_cover_letter,
+                           client, merged_data, job_description, company_name, position_title),
+            _optional_call("Interview questions", generate_interview_questions, _post_interview_questions,
+                           client, merged_data, job_description, company_name, position_title),
+        )
 
         # Prepare response
         response_data = {
@@ -202,16 +302,22 @@ async def process_resume(
             "ats_recommendations": ats_data.get("recommendations", []),
             "keyword_matches": ats_data.get("keyword_matches", {}),
             "score_breakdown": ats_data.get("score_breakdown", {}),
-            "resume_file_path": temp_resume.name,
-            "resume_html_preview": html_preview,
+            "resume_file_path": resume_path,
             "cover_letter_path": cover_letter_path,
             "interview_questions_path": interview_questions_path
         }
 
-        return JSONResponse(content=response_data)
+        # Clients that only want the DOCX pass include_html_preview=false and
+        # skip the /render-html round trip entirely
+        if include_html_preview:
+            response_data["resume_html_preview"] = html_preview
+
+        # Serialize the (potentially large) response in the pool as well
+        body = await loop.run_in_executor(executor, orjson.dumps, response_data)
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
@@ -220,24 +326,30 @@ async def process_resume(
 async def download_file(file_type: str, file_path: str):
     """Download generated files"""
     try:
-        if not os.path.exists(file_path):
+        # One stat for both the existence check and the response headers
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
             raise HTTPException(status_code=404, detail="File not found")
 
         if file_type == "resume":
             return FileResponse(
                 path=file_path,
+                stat_result=stat_result,
                 filename="Harvard_Resume.docx",
                 media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
             )
         elif file_type == "cover_letter":
             return FileResponse(
                 path=file_path,
+                stat_result=stat_result,
                 filename="Cover_Letter.txt",
                 media_type="text/plain"
             )
         elif file_type == "interview_questions":
             return FileResponse(
                 path=file_path,
+                stat_result=stat_result,
                 filename="Interview_Questions.txt",
                 media_type="text/plain"
             )
@@ -247,15 +359,26 @@ async def download_file(file_type: str, file_path: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Last backend probe result as (time.monotonic() stamp, status); frequent
+# liveness probes within the TTL reuse it instead of hitting the backend
+_BACKEND_HEALTH_TTL = 2.0
+_backend_health_cache = (float("-inf"), "unknown")
+
+
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
-    try:
-        # Test backend connection
-        r = requests.get(f"{API_BASE}/", timeout=5)
-        backend_status = "healthy" if r.status_code == 200 else "unhealthy"
-    except:
-        backend_status = "unreachable"
+    global _backend_health_cache
+    checked_at, backend_status = _backend_health_cache
+    now = time.monotonic()
+    if now - checked_at >= _BACKEND_HEALTH_TTL:
+        try:
+            # Test backend connection; HEAD skips the response body
+            r = await request.app.state.http.head("/", timeout=2)
+            backend_status = "healthy" if r.status_code == 200 else "unhealthy"
+        except:
+            backend_status = "unreachable"
+        _backend_health_cache = (now, backend_status)
 
     return {
         "status": "healthy",
@@ -264,6 +387,8 @@ async def health_check():
     }
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "web_app:app",
         host="127.0.0.1",
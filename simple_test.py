@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 import requests
-import json
 
 def simple_test():
+    # One session for both calls so the parse request reuses the connection
+    with requests.Session() as session:
+        _run(session)
+
+
+def _run(session):
     # Test health endpoint
     try:
         print("Testing health endpoint...")
-        response = requests.get("http://localhost:8000/")
+        response = session.get("http://localhost:8000/", timeout=5)
         print(f"Health: {response.status_code} - {response.json()}")
     except Exception as e:
         print(f"Health check failed: {e}")
@@ -16,7 +21,7 @@ def simple_test():
         print("\nTesting parse endpoint...")
         with open("samples/resume.pdf", "rb") as f:
             files = {"file": ("resume.pdf", f, "application/pdf")}
-            response = requests.post("http://localhost:8000/parse", files=files, timeout=30)
+            response = session.post("http://localhost:8000/parse", files=files, timeout=30)
 
         print(f"Parse: {response.status_code}")
         if response.status_code == 200:
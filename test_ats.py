@@ -0,0 +1,31 @@
+from backend.ats import _categorize_keywords
+
+
+def test_categorize_keywords():
+    technical, business = _categorize_keywords([
+        # exact, plural and '-ies' plural forms
+        "python", "apis", "libraries", "databases",
+        # sentence-final tokens keep their '.'
+        "python.", "docker.",
+        # compound and derived forms
+        "github", "mysql", "pyspark", "restful", "typescript",
+        "cloudformation", "dockerized", "pythonic",
+        # dotted names
+        "vue.js",
+        # no longer technical through a substring ('api' in 'rapid')
+        "rapid",
+        # business terms, plural included
+        "stakeholders", "planning", "teamwork",
+    ])
+
+    assert set(technical) == {
+        "python", "apis", "libraries", "databases", "python.", "docker.",
+        "github", "mysql", "pyspark", "restful", "typescript",
+        "cloudformation", "dockerized", "pythonic", "vue.js",
+    }
+    assert set(business) == {"rapid", "stakeholders", "planning", "teamwork"}
+
+
+if __name__ == "__main__":
+    test_categorize_keywords()
+    print("✅ ATS keyword categorization OK")
@@ -1,4 +1,8 @@
-from backend.renderer import render_harvard
+import io
+import mmap
+import os
+
+from backend.renderer import render_harvard, render_harvard_batch
 
 resume_json = {
     "contact_info": {
@@ -31,5 +35,30 @@ resume_json = {
     "languages": ["English", "Hindi"]
 }
 
-render_harvard(resume_json, "test_resume.docx", "AI Engineer at TechCorp")
+# Render in memory, then hand the whole archive to the OS in one bulk copy
+buf = io.BytesIO()
+render_harvard(resume_json, buf, "AI Engineer at TechCorp")
+data = buf.getbuffer()
+
+if os.name == "posix":
+    fd = os.open("test_resume.docx", os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, len(data))
+        with mmap.mmap(fd, len(data)) as mm:
+            mm[:] = data
+    finally:
+        os.close(fd)
+else:
+    with open("test_resume.docx", "wb") as f:
+        f.write(data)
 print("✅ DOCX generated: test_resume.docx")
+
+if __name__ == "__main__":
+    # Batch path: two worker processes, each saving to a file path
+    batch_paths = render_harvard_batch([resume_json, resume_json],
+                                       ["test_resume_batch_1.docx", "test_resume_batch_2.docx"],
+                                       max_workers=2)
+    for path in batch_paths:
+        with open(path, "rb") as f:
+            assert f.read() == data, f"{path} differs from the in-memory render"
+    print(f"✅ Batch DOCX generated: {', '.join(batch_paths)}")